@@ -5,19 +5,35 @@ Adaptive coaching agent with GLP-1 awareness and shame-free language
 
 import json
 import os
+import sys
+import time
+from functools import lru_cache
+from pathlib import Path
 from typing import Dict, Any, Optional
+import boto3
+import orjson
 from strands import Agent
 from strands.models import BedrockModel
 from bedrock_agentcore import BedrockAgentCoreApp
 
+# Each agent directory is its own deployment root; the shared context
+# module lives one level up in agents/common (bundle it when deploying)
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from common.aws import BEDROCK_CLIENT_CONFIG
+from common.context import render_context
+
+
+# Shared boto3 session - credentials are resolved once at import instead of
+# per BedrockModel construction
+_BOTO_SESSION = boto3.Session()
+
 
 # Create AgentCore app
 app = BedrockAgentCoreApp()
 
 
-def build_system_prompt() -> str:
-    """Build the comprehensive system prompt for coaching behavior."""
-    return """You are a compassionate, adaptive weight management coach for the Vitracka app.
+# System prompt is a constant - build it once at import time, not per request
+_SYSTEM_PROMPT = """You are a compassionate, adaptive weight management coach for the Vitracka app.
 
 CORE PRINCIPLES:
 1. SHAME-FREE LANGUAGE: Never use guilt, shame, or judgment. Reframe setbacks as learning opportunities.
@@ -53,90 +69,135 @@ RESPONSE GUIDELINES:
 Remember: Your role is to support, not judge. Every interaction should leave the user feeling motivated and capable."""
 
 
-def create_coach_agent(user_context: Dict[str, Any] = None) -> Agent:
-    """Create the coach companion agent with context-aware system prompt."""
-    
-    # Configure Bedrock model
-    # Use EU inference profile for Claude 3.5 Sonnet in eu-west-1
-    model = BedrockModel(
-        model_id=os.getenv("MODEL_ID", "eu.anthropic.claude-3-5-sonnet-20240620-v1:0"),
-        region_name=os.getenv("AWS_REGION", "eu-west-1"),
-        temperature=0.7,
-        max_tokens=1024,
-    )
-    
-    # Build system prompt with context
-    system_prompt = build_system_prompt()
-    
-    if user_context:
-        context_parts = []
-        
-        if user_context.get("coaching_style"):
-            context_parts.append(f"Use {user_context['coaching_style']} coaching style")
-        
-        if user_context.get("on_glp1"):
-            context_parts.append("User is on GLP-1 medication - focus on nutrition quality")
-        
-        if user_context.get("goal_type"):
-            goal_type = user_context["goal_type"]
-            if goal_type == "loss":
-                context_parts.append("User is actively losing weight")
-            elif goal_type == "maintenance":
-                context_parts.append("User is maintaining their weight")
-            elif goal_type == "transition":
-                context_parts.append("User is transitioning to maintenance")
-        
-        if user_context.get("gamification_preference"):
-            pref = user_context["gamification_preference"]
-            if pref == "high":
-                context_parts.append("User loves competitive challenges and achievements")
-            elif pref == "low":
-                context_parts.append("User prefers minimal gamification")
-        
-        if context_parts:
-            system_prompt += f"\n\nCONTEXT: {'. '.join(context_parts)}."
-    
-    # Create agent
-    agent = Agent(
-        model=model,
-        system_prompt=system_prompt
+def build_system_prompt() -> str:
+    """Return the precomputed system prompt for coaching behavior."""
+    return _SYSTEM_PROMPT
+
+
+# Shared model and base agent - constructed once at import so the handler
+# never pays BedrockModel/Agent construction (boto3 client setup, credential
+# resolution) on the request path
+_MODEL = BedrockModel(
+    model_id=os.getenv("MODEL_ID", "eu.anthropic.claude-3-5-sonnet-20240620-v1:0"),
+    region_name=os.getenv("AWS_REGION", "eu-west-1"),
+    temperature=0.7,
+    max_tokens=256,  # Coaching replies are 2-3 sentences; don't budget for 1024
+
+    cache_prompt="default",  # Cache the static system prompt server-side (prompt caching)
+    boto_session=_BOTO_SESSION,
+    boto_client_config=BEDROCK_CLIENT_CONFIG,
+)
+
+_BASE_AGENT = Agent(
+    model=_MODEL,
+    system_prompt=_SYSTEM_PROMPT
+)
+
+
+def _warmup() -> None:
+    """Issue a tiny dummy call at import to absorb cold-start costs.
+
+    Forces credential resolution, endpoint discovery, and the TLS handshake
+    to bedrock-runtime during cold start rather than on the first user's
+    request. Uses a throwaway Agent sharing the warm model so the base
+    agent's conversation history stays clean.
+    """
+    try:
+        Agent(model=_MODEL, system_prompt="Reply with the single word: pong")("ping")
+    except Exception:
+        # A Bedrock throttle or transient failure must not break startup
+        pass
+
+
+# Skipped for local --local-test runs via AGENT_WARMUP=0
+if os.getenv("AGENT_WARMUP", "1") == "1":
+    _warmup()
+
+
+@lru_cache(maxsize=64)
+def _get_context_agent(context_suffix: str) -> Agent:
+    """Get the agent for a context suffix, reusing the shared model."""
+    return Agent(
+        model=_MODEL,
+        system_prompt=_SYSTEM_PROMPT + context_suffix
     )
-    
-    return agent
+
+
+def create_coach_agent(user_context: Dict[str, Any] = None) -> Agent:
+    """Get the coach companion agent with context-aware system prompt.
+
+    Reuses the shared base agent when no context is supplied; distinct
+    context combinations map to a small cache of agents sharing one model.
+    """
+    context = render_context(user_context)
+    if not context:
+        return _BASE_AGENT
+
+    return _get_context_agent(f"\n\nCONTEXT: {context}.")
+
+
+async def _stream_response(agent: Agent, message: str):
+    """Yield response text chunks as the model produces them.
+
+    Logs ttft_ms (request receipt to first yielded chunk) separately from
+    total latency so TTFT regressions are visible in CloudWatch. The
+    generator runs after handler() has returned, outside its try/except,
+    so failures are caught here to keep the apologize-and-retry contract
+    the non-streaming path has.
+    """
+    start_ns = time.perf_counter_ns()
+    first_chunk = True
+    try:
+        async for stream_event in agent.stream_async(message):
+            if "data" in stream_event:
+                if first_chunk:
+                    ttft_ms = (time.perf_counter_ns() - start_ns) / 1_000_000
+                    print(f"ttft_ms={ttft_ms:.0f}")
+                    first_chunk = False
+                yield stream_event["data"]
+    except Exception as e:
+        yield f"I apologize, but I encountered an error: {str(e)}. Let's try again!"
 
 
 @app.entrypoint
-def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+def handler(event: Dict[str, Any], context: Any):
     """
     AgentCore Runtime handler function.
-    
+
     Args:
         event: Input event containing the user's message and context
         context: Runtime context (provided by AgentCore)
-        
+
     Returns:
-        Response dictionary with coaching message
+        Response dictionary with coaching message, or a stream of response
+        chunks when the event sets "stream": true
     """
     try:
-        # Extract input from event
+        # Parse once - AgentCore usually hands us an already-decoded dict
         if isinstance(event, str):
-            event = json.loads(event)
-        
-        message = event.get("prompt", event.get("message", ""))
+            event = orjson.loads(event)
+
+        # Avoid evaluating the "message" fallback when "prompt" is present
+        message = event["prompt"] if "prompt" in event else event.get("message")
         user_context = event.get("user_context", {})
-        
+
         if not message:
             message = "Hello! I'm here to support you on your weight management journey."
-        
-        # Create and invoke agent
+
         agent = create_coach_agent(user_context)
+
+        # Streaming callers get the first token as soon as prefill finishes
+        # instead of waiting for the full decode
+        if event.get("stream"):
+            return _stream_response(agent, message)
+
         response = agent(message)
-        
+
         # Return response in AgentCore format
         return {
             "response": response.message
         }
-        
+
     except Exception as e:
         return {
             "response": f"I apologize, but I encountered an error: {str(e)}. Let's try again!"
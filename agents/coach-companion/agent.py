@@ -6,36 +6,52 @@ Adaptive coaching agent with GLP-1 awareness and shame-free language
 from strands import Agent, tool
 from strands.models import BedrockModel
 from typing import Dict, Any, Optional
+import boto3
 import os
+import sys
+import threading
+import time
+from pathlib import Path
 
+from cachetools import TTLCache
 
-class CoachCompanionAgent:
-    """
-    AI-powered coaching agent that adapts to user preferences and context.
-    Uses AWS Bedrock with Claude for natural, empathetic coaching.
-    """
-    
-    def __init__(self):
-        """Initialize the Coach Companion agent with Bedrock model."""
-        # Configure Bedrock model using inference profile
-        # Using Claude 3.5 Sonnet (already approved for API access)
-        self.model = BedrockModel(
-            model_id="us.anthropic.claude-3-5-sonnet-20241022-v2:0",  # Claude 3.5 Sonnet v2
-            region_name=os.getenv("AWS_REGION", "us-east-1"),
-            temperature=0.7,  # Balanced for empathetic yet consistent coaching
-            max_tokens=2048,
-        )
-        
-        # Create agent with coaching tools
-        self.agent = Agent(
-            model=self.model,
-            tools=[self._get_user_context_tool()],
-            system_prompt=self._build_system_prompt()
-        )
-    
-    def _build_system_prompt(self) -> str:
-        """Build the comprehensive system prompt for coaching behavior."""
-        return """You are a compassionate, adaptive weight management coach for the Vitracka app.
+# Each agent directory is its own deployment root; the shared context
+# module lives one level up in agents/common (bundle it when deploying)
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from common.aws import BEDROCK_CLIENT_CONFIG
+from common.context import render_context
+
+
+# Shared boto3 session - credentials are resolved once at import instead of
+# per BedrockModel construction
+_BOTO_SESSION = boto3.Session()
+
+# Model singletons - coaching check-ins are 2-3 sentences, so Haiku with a
+# tight token budget handles "short" turns at a fraction of Sonnet's TTFT;
+# Sonnet is kept for the rare "long" planning requests
+_SONNET_MODEL = BedrockModel(
+    model_id="us.anthropic.claude-3-5-sonnet-20241022-v2:0",  # Claude 3.5 Sonnet v2
+    region_name=os.getenv("AWS_REGION", "us-east-1"),
+    temperature=0.7,  # Balanced for empathetic yet consistent coaching
+    max_tokens=256,
+    cache_prompt="default",  # Cache the static system prompt server-side (prompt caching)
+    boto_session=_BOTO_SESSION,
+    boto_client_config=BEDROCK_CLIENT_CONFIG,
+)
+
+_HAIKU_MODEL = BedrockModel(
+    model_id="us.anthropic.claude-3-5-haiku-20241022-v1:0",  # Claude 3.5 Haiku
+    region_name=os.getenv("AWS_REGION", "us-east-1"),
+    temperature=0.7,
+    max_tokens=200,
+    cache_prompt="default",  # Cache the static system prompt server-side (prompt caching)
+    boto_session=_BOTO_SESSION,
+    boto_client_config=BEDROCK_CLIENT_CONFIG,
+)
+
+
+# System prompt is a constant - build it once at import time, not per request
+_SYSTEM_PROMPT = """You are a compassionate, adaptive weight management coach for the Vitracka app.
 
 CORE PRINCIPLES:
 1. SHAME-FREE LANGUAGE: Never use guilt, shame, or judgment. Reframe setbacks as learning opportunities.
@@ -70,6 +86,38 @@ RESPONSE GUIDELINES:
 
 Remember: Your role is to support, not judge. Every interaction should leave the user feeling motivated and capable."""
 
+class CoachCompanionAgent:
+    """
+    AI-powered coaching agent that adapts to user preferences and context.
+    Uses AWS Bedrock with Claude for natural, empathetic coaching.
+    """
+    
+    def __init__(self):
+        """Initialize the Coach Companion agent with Bedrock models."""
+        # Sonnet handles the rare "long" plan-my-week turns
+        self.model = _SONNET_MODEL
+
+        # Create agents with coaching tools - one per model so short
+        # check-ins route to Haiku without rebuilding anything per request
+        self.agent = Agent(
+            model=_SONNET_MODEL,
+            tools=[self._get_user_context_tool()],
+            system_prompt=self._build_system_prompt()
+        )
+        self.short_agent = Agent(
+            model=_HAIKU_MODEL,
+            tools=[self._get_user_context_tool()],
+            system_prompt=self._build_system_prompt()
+        )
+
+    def _select_agent(self, complexity: str) -> Agent:
+        """Pick the agent for a turn: Haiku for short, Sonnet for long."""
+        return self.agent if complexity == "long" else self.short_agent
+    
+    def _build_system_prompt(self) -> str:
+        """Return the precomputed system prompt for coaching behavior."""
+        return _SYSTEM_PROMPT
+
     def _get_user_context_tool(self) -> callable:
         """Create a tool for accessing user context during conversations."""
         @tool
@@ -93,73 +141,125 @@ Remember: Your role is to support, not judge. Every interaction should leave the
         
         return get_user_context
     
-    def coach(
+    def _build_prompt(
         self,
         message: str,
         user_context: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """Build the context-aware prompt for a coaching turn."""
+        # Context sentence is cached per distinct context combination
+        context_prompt = ""
+        context = render_context(user_context)
+        if context:
+            context_prompt = f"\n\nCONTEXT: {context}.\n\n"
+
+        return f"{context_prompt}USER MESSAGE: {message}"
+
+    def coach(
+        self,
+        message: str,
+        user_context: Optional[Dict[str, Any]] = None,
+        complexity: str = "short"
     ) -> str:
         """
         Generate a coaching response based on user message and context.
-        
+
         Args:
             message: The user's message or question
             user_context: Optional context about the user (coaching style, GLP-1 status, etc.)
-            
+            complexity: "short" (default) routes to Haiku; "long" to Sonnet
+
         Returns:
             Coaching response as a string
         """
-        # Build context-aware prompt
-        context_prompt = ""
-        if user_context:
-            context_parts = []
-            
-            if user_context.get("coaching_style"):
-                context_parts.append(f"Use {user_context['coaching_style']} coaching style")
-            
-            if user_context.get("on_glp1"):
-                context_parts.append("User is on GLP-1 medication - focus on nutrition quality")
-            
-            if user_context.get("goal_type"):
-                goal_type = user_context["goal_type"]
-                if goal_type == "loss":
-                    context_parts.append("User is actively losing weight")
-                elif goal_type == "maintenance":
-                    context_parts.append("User is maintaining their weight")
-                elif goal_type == "transition":
-                    context_parts.append("User is transitioning to maintenance")
-            
-            if user_context.get("gamification_preference"):
-                pref = user_context["gamification_preference"]
-                if pref == "high":
-                    context_parts.append("User loves competitive challenges and achievements")
-                elif pref == "low":
-                    context_parts.append("User prefers minimal gamification")
-            
-            if context_parts:
-                context_prompt = f"\n\nCONTEXT: {'. '.join(context_parts)}.\n\n"
-        
-        # Generate response using the agent
-        full_prompt = f"{context_prompt}USER MESSAGE: {message}"
-        response = self.agent(full_prompt)
-        
+        agent = self._select_agent(complexity)
+        response = agent(self._build_prompt(message, user_context))
+
         return response
+
+    async def coach_stream(
+        self,
+        message: str,
+        user_context: Optional[Dict[str, Any]] = None,
+        complexity: str = "short"
+    ):
+        """
+        Stream a coaching response as text chunks.
+
+        Yields chunks as soon as the model produces them, so callers see
+        the first token at time-to-first-token instead of waiting for the
+        full generation to complete.
+
+        Args:
+            message: The user's message or question
+            user_context: Optional context about the user (coaching style, GLP-1 status, etc.)
+
+        Yields:
+            Response text chunks as they are generated
+        """
+        agent = self._select_agent(complexity)
+        full_prompt = self._build_prompt(message, user_context)
+        start_ns = time.perf_counter_ns()
+        first_chunk = True
+        async for event in agent.stream_async(full_prompt):
+            if "data" in event:
+                if first_chunk:
+                    ttft_ms = (time.perf_counter_ns() - start_ns) / 1_000_000
+                    print(f"ttft_ms={ttft_ms:.0f}")
+                    first_chunk = False
+                yield event["data"]
     
     def reset_conversation(self):
         """Reset the conversation history for a new session."""
-        # Create a new agent instance to clear history
-        self.agent = Agent(
-            model=self.model,
-            tools=[self._get_user_context_tool()],
-            system_prompt=self._build_system_prompt()
-        )
+        try:
+            # Clear history in place - keeps the bound models, tools, and
+            # system prompts instead of rebuilding both agents from scratch
+            self.agent.messages.clear()
+            self.short_agent.messages.clear()
+        except AttributeError:
+            # Fallback for SDK versions that don't expose message state
+            self.agent = Agent(
+                model=_SONNET_MODEL,
+                tools=[self._get_user_context_tool()],
+                system_prompt=self._build_system_prompt()
+            )
+            self.short_agent = Agent(
+                model=_HAIKU_MODEL,
+                tools=[self._get_user_context_tool()],
+                system_prompt=self._build_system_prompt()
+            )
+
+
+# Per-session agent pool - one agent per session_id so one caller's history
+# never leaks into another's turn (the old global singleton shared history
+# across every HTTP caller). Stable per-session prefixes also let Bedrock
+# prompt caching hit across turns. Idle sessions are evicted after the TTL.
+_SESSION_TTL_SECONDS = 1800
+_sessions: TTLCache = TTLCache(maxsize=10_000, ttl=_SESSION_TTL_SECONDS)
+_sessions_lock = threading.Lock()
 
 
-# Singleton instance
-_agent_instance = None
+def get_agent(session_id: Optional[str] = None) -> CoachCompanionAgent:
+    """Get or create the agent for a session.
 
-def get_agent() -> CoachCompanionAgent:
-    """Get or create the singleton agent instance."""
-    global _agent_instance
-    if _agent_instance is None:
-        _agent_instance = CoachCompanionAgent()
-    return _agent_instance
+    Agents share the module-level model singletons, so a new session only
+    allocates the lightweight Agent wrappers and their history lists.
+    """
+    key = session_id or "default"
+    with _sessions_lock:
+        agent = _sessions.get(key)
+        if agent is None:
+            agent = CoachCompanionAgent()
+            _sessions[key] = agent
+        return agent
+
+
+def reset_session(session_id: Optional[str] = None) -> bool:
+    """Drop a single session's conversation state.
+
+    Returns:
+        True if the session existed
+    """
+    key = session_id or "default"
+    with _sessions_lock:
+        return _sessions.pop(key, None) is not None
@@ -4,11 +4,13 @@ Exposes the Strands agent via HTTP endpoints
 """
 
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
-from typing import Optional, Dict, Any
+from typing import Literal, Optional, Dict, Any
+import asyncio
 import uvicorn
 import os
-from agent import get_agent
+from agent import get_agent, reset_session
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -26,12 +28,20 @@ class CoachingRequest(BaseModel):
         description="User context (coaching_style, on_glp1, goal_type, gamification_preference)"
     )
     session_id: Optional[str] = Field(None, description="Session ID for conversation continuity")
+    complexity: Literal["short", "long"] = Field(
+        "short",
+        description="'short' routes to the fast Haiku model; 'long' to Sonnet for complex planning"
+    )
 
 class CoachingResponse(BaseModel):
     """Response model for coaching interactions."""
     response: str = Field(..., description="Coach's response")
     session_id: Optional[str] = Field(None, description="Session ID")
 
+class ResetRequest(BaseModel):
+    """Request model for conversation resets."""
+    session_id: Optional[str] = Field(None, description="Session ID to reset")
+
 class HealthResponse(BaseModel):
     """Health check response."""
     status: str
@@ -49,34 +59,83 @@ async def health_check():
     )
 
 
-@app.post("/coach", response_model=CoachingResponse)
+def _sse_data(text: str) -> str:
+    """Frame text as SSE data: lines.
+
+    A bare newline inside a data line would terminate the event early, so
+    multi-line text becomes consecutive data: lines within one event.
+    """
+    return "".join(f"data: {line}\n" for line in text.split("\n"))
+
+
+@app.post("/coach")
 async def coach(request: CoachingRequest):
     """
-    Generate a coaching response based on user message and context.
-    
+    Stream a coaching response as server-sent events.
+
+    The first token is sent as soon as the model produces it, so clients
+    see time-to-first-token latency instead of full-generation latency.
+
+    Args:
+        request: CoachingRequest with message and optional context
+
+    Returns:
+        StreamingResponse emitting SSE data events with response chunks
+    """
+    agent = get_agent(request.session_id)
+
+    async def event_stream():
+        try:
+            async for chunk in agent.coach_stream(
+                message=request.message,
+                user_context=request.user_context,
+                complexity=request.complexity
+            ):
+                yield f"{_sse_data(chunk)}\n"
+        except Exception as e:
+            # Mid-stream failures can't become an HTTP 500 (headers are
+            # already sent), so surface them as a terminal error event;
+            # the error text needs the same framing as chunks, since
+            # botocore/validation messages can span multiple lines
+            yield (f"event: error\n"
+                   f"{_sse_data(f'Failed to generate coaching response: {str(e)}')}\n")
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
+@app.post("/coach/sync", response_model=CoachingResponse)
+async def coach_sync(request: CoachingRequest):
+    """
+    Generate a complete coaching response (non-streaming).
+
+    Kept for clients that can't consume server-sent events.
+
     Args:
         request: CoachingRequest with message and optional context
-        
+
     Returns:
         CoachingResponse with the agent's response
-        
+
     Raises:
         HTTPException: If agent fails to generate response
     """
     try:
-        agent = get_agent()
-        
-        # Generate coaching response
-        response = agent.coach(
+        agent = get_agent(request.session_id)
+
+        # Run the blocking Strands call in a worker thread so one slow
+        # Bedrock generation doesn't stall the whole event loop
+        response = await asyncio.to_thread(
+            agent.coach,
             message=request.message,
-            user_context=request.user_context
+            user_context=request.user_context,
+            complexity=request.complexity
         )
-        
+
         return CoachingResponse(
             response=response,
             session_id=request.session_id
         )
-    
+
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -85,22 +144,24 @@ async def coach(request: CoachingRequest):
 
 
 @app.post("/reset")
-async def reset_conversation(session_id: Optional[str] = None):
+async def reset_conversation(request: Optional[ResetRequest] = None):
     """
-    Reset conversation history for a new session.
-    
+    Reset conversation history for a single session.
+
+    The session ID comes from the JSON body ({"session_id": ...}), which
+    is how the Node bridge (CoachCompanionClient.resetConversation) sends it.
+
     Args:
-        session_id: Optional session ID to reset
-        
+        request: Optional ResetRequest with the session ID to reset
+
     Returns:
         Success message
     """
     try:
-        agent = get_agent()
-        agent.reset_conversation()
-        
+        reset_session(request.session_id if request else None)
+
         return {"status": "success", "message": "Conversation reset"}
-    
+
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -115,5 +176,6 @@ if __name__ == "__main__":
         "api:app",
         host="0.0.0.0",
         port=port,
-        reload=True  # Enable auto-reload during development
+        workers=int(os.getenv("WORKERS", "1")),
+        reload=False  # Reload disables multi-worker and adds watcher overhead
     )
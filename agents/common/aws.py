@@ -0,0 +1,23 @@
+"""
+Shared botocore client configuration for Bedrock calls.
+
+Every BedrockModel in the codebase uses this config so the HTTP pool is
+bounded and reused instead of each client getting botocore's default
+10-connection pool (under concurrent /coach load, requests queue on the
+pool before the model even sees them).
+"""
+
+import os
+
+from botocore.config import Config
+
+
+# Pool size is tunable per environment via BEDROCK_POOL; size it so
+# uvicorn workers x pool stays within the Bedrock account quota
+BEDROCK_CLIENT_CONFIG = Config(
+    max_pool_connections=int(os.getenv("BEDROCK_POOL", "64")),
+    tcp_keepalive=True,
+    retries={"mode": "adaptive", "max_attempts": 3},
+    connect_timeout=3,
+    read_timeout=120,
+)
@@ -0,0 +1,70 @@
+"""
+Shared user-context rendering for the coach agents.
+
+Both the Strands and AgentCore coach agents append the same CONTEXT
+sentence to their prompts; this module is the single copy of that logic
+so the lookup tables and cache are maintained (and optimized) in one
+place.
+"""
+
+from functools import lru_cache
+from typing import Dict, Any, Optional
+
+
+# Context fragment lookup tables - precomputed so context assembly is
+# dict lookups instead of an if/elif cascade on every request
+_GOAL_CONTEXT = {
+    "loss": "User is actively losing weight",
+    "maintenance": "User is maintaining their weight",
+    "transition": "User is transitioning to maintenance",
+}
+
+_GAMIFICATION_CONTEXT = {
+    "high": "User loves competitive challenges and achievements",
+    "low": "User prefers minimal gamification",
+}
+
+
+@lru_cache(maxsize=256)
+def _render_context(
+    coaching_style: Optional[str],
+    on_glp1: bool,
+    goal_type: Optional[str],
+    gamification_preference: Optional[str],
+) -> str:
+    """Render the CONTEXT sentence for a user-context combination, or ''.
+
+    There are only a handful of distinct combinations in practice, so the
+    lru_cache means each is assembled exactly once.
+    """
+    context_parts = []
+
+    if coaching_style:
+        context_parts.append(f"Use {coaching_style} coaching style")
+
+    if on_glp1:
+        context_parts.append("User is on GLP-1 medication - focus on nutrition quality")
+
+    goal_context = _GOAL_CONTEXT.get(goal_type)
+    if goal_context:
+        context_parts.append(goal_context)
+
+    gamification_context = _GAMIFICATION_CONTEXT.get(gamification_preference)
+    if gamification_context:
+        context_parts.append(gamification_context)
+
+    if not context_parts:
+        return ""
+    return ". ".join(context_parts)
+
+
+def render_context(user_context: Optional[Dict[str, Any]]) -> str:
+    """Render the CONTEXT sentence for a user_context dict, or ''."""
+    if not user_context:
+        return ""
+    return _render_context(
+        user_context.get("coaching_style"),
+        bool(user_context.get("on_glp1")),
+        user_context.get("goal_type"),
+        user_context.get("gamification_preference"),
+    )
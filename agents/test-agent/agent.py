@@ -6,12 +6,24 @@ This minimal agent tests the deployment pipeline before deploying production age
 from strands import Agent
 from strands.models import BedrockModel
 from bedrock_agentcore import BedrockAgentCoreApp
+import boto3
 import os
+import sys
+from pathlib import Path
+
+# The shared AWS client config lives one level up in agents/common
+# (bundle it when deploying)
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from common.aws import BEDROCK_CLIENT_CONFIG
 
 
 # Create AgentCore app
 app = BedrockAgentCoreApp()
 
+# Shared boto3 session - credentials are resolved once at import instead of
+# per BedrockModel construction
+_BOTO_SESSION = boto3.Session()
+
 
 def create_test_agent():
     """Create a simple test agent that echoes messages."""
@@ -23,6 +35,8 @@ def create_test_agent():
         region_name=os.getenv("AWS_REGION", "us-east-1"),
         temperature=0.7,
         max_tokens=512,
+        boto_session=_BOTO_SESSION,
+        boto_client_config=BEDROCK_CLIENT_CONFIG,
     )
     
     # Create simple agent
@@ -5,6 +5,7 @@ Exposes the Strands test agent via HTTP endpoints
 
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel, Field
+import asyncio
 import uvicorn
 import os
 from agent import create_test_agent
@@ -72,7 +73,9 @@ async def test(request: TestRequest):
     """
     try:
         agent = get_agent()
-        response = agent(request.message)
+        # Run the blocking Strands call in a worker thread so one slow
+        # Bedrock generation doesn't stall the whole event loop
+        response = await asyncio.to_thread(agent, request.message)
         
         # Extract text from response - handle both string and dict formats
         if isinstance(response.message, str):
@@ -1,48 +1,59 @@
 """Test script to invoke the deployed AgentCore agent."""
 
 import boto3
-import json
+import orjson
+import os
+
+# Pretty-printed diagnostics only when debugging - indent doubles the
+# serialization work and output size
+DEBUG = os.getenv("DEBUG") == "1"
 
 # Agent details from deployment
 AGENT_ARN = "arn:aws:bedrock-agentcore:us-east-1:732231126129:runtime/agent-QVq5tY47wq"
 REGION = "us-east-1"
 
+# Module-level session and client - reused across invocations so credentials
+# and endpoint discovery are resolved once
+session = boto3.Session()
+client = session.client('bedrock-agentcore', region_name=REGION)
+
 def test_agent_invocation():
     """Test invoking the deployed agent."""
     print("Testing deployed agent invocation...")
     print(f"Agent ARN: {AGENT_ARN}")
     print(f"Region: {REGION}\n")
-    
+
     try:
         print("Invoking agent with bedrock-agentcore client...")
-        client = boto3.client('bedrock-agentcore', region_name=REGION)
-        
+
         # Use correct parameters: agentRuntimeArn and payload
-        payload = json.dumps({'prompt': 'Hello from the deployed agent!'})
-        
+        payload = orjson.dumps({'prompt': 'Hello from the deployed agent!'})
+
         response = client.invoke_agent_runtime(
             agentRuntimeArn=AGENT_ARN,
             payload=payload,
             contentType='application/json',
             accept='application/json'
         )
-        
-        print("\nRaw response:")
-        print(json.dumps(response, indent=2, default=str))
-        
+
+        if DEBUG:
+            print("\nRaw response:")
+            print(orjson.dumps(response, option=orjson.OPT_INDENT_2, default=str).decode())
+
         # Extract and parse the response payload
         if 'payload' in response:
-            response_payload = response['payload'].read().decode('utf-8')
+            response_payload = response['payload'].read()
             print("\n📝 Agent output:")
-            print(response_payload)
-            
-            try:
-                parsed = json.loads(response_payload)
-                print("\nParsed response:")
-                print(json.dumps(parsed, indent=2))
-            except:
-                pass
-        
+            print(response_payload.decode('utf-8'))
+
+            if DEBUG:
+                try:
+                    parsed = orjson.loads(response_payload)
+                    print("\nParsed response:")
+                    print(orjson.dumps(parsed, option=orjson.OPT_INDENT_2).decode())
+                except:
+                    pass
+
         print("\n✓ Agent invocation successful!")
         return True
         
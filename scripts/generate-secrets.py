@@ -9,8 +9,9 @@ import string
 
 def generate_jwt_secret(length=64):
     """Generate a secure JWT secret (64 characters)"""
-    alphabet = string.ascii_letters + string.digits + '_-'
-    return ''.join(secrets.choice(alphabet) for _ in range(length))
+    # token_urlsafe draws all the randomness in one bulk call and emits
+    # URL-safe base64 (letters, digits, '_', '-') - same alphabet as before
+    return secrets.token_urlsafe(length)[:length]
 
 def generate_encryption_key(length=32):
     """Generate a secure encryption key (exactly 32 characters for AES-256)"""
@@ -20,14 +21,23 @@ def generate_encryption_key(length=32):
 
 def generate_api_secret_key(length=64):
     """Generate a secure API secret key (64 characters)"""
-    alphabet = string.ascii_letters + string.digits + '_-'
-    return ''.join(secrets.choice(alphabet) for _ in range(length))
+    return secrets.token_urlsafe(length)[:length]
 
 def generate_database_password(length=32):
     """Generate a secure database password (32 characters)"""
-    # Include special characters for database password
-    alphabet = string.ascii_letters + string.digits + '!@#$%^&*'
-    return ''.join(secrets.choice(alphabet) for _ in range(length))
+    # Include special characters for database password; bulk token_bytes
+    # draws mapped onto the alphabet instead of a per-character CSPRNG call.
+    # Bytes at or above the largest multiple of the alphabet size are
+    # rejected and redrawn - a plain modulo over the 70-char alphabet would
+    # make the first 46 characters 4/256 likely vs 3/256 for the rest.
+    alphabet = (string.ascii_letters + string.digits + '!@#$%^&*').encode()
+    limit = 256 - (256 % len(alphabet))
+    password = bytearray()
+    while len(password) < length:
+        password.extend(alphabet[b % len(alphabet)]
+                        for b in secrets.token_bytes(length - len(password))
+                        if b < limit)
+    return password.decode()
 
 def main():
     print("=" * 70)
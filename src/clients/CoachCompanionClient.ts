@@ -41,10 +41,13 @@ export class CoachCompanionClient {
 
     /**
      * Generate a coaching response from the AI agent
+     *
+     * Uses the non-streaming /coach/sync endpoint - /coach now streams
+     * server-sent events, which axios' JSON handling can't consume.
      */
     async coach(request: CoachingRequest): Promise<CoachingResponse> {
         try {
-            const response = await this.client.post<CoachingResponse>('/coach', request);
+            const response = await this.client.post<CoachingResponse>('/coach/sync', request);
             return response.data;
         } catch (error) {
             if (axios.isAxiosError(error)) {
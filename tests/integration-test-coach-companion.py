@@ -12,30 +12,59 @@ Tests cover:
 """
 
 import sys
-import io
 import boto3
+import concurrent.futures
 import json
+import orjson
+import os
+import re
+import threading
 import time
 import uuid
+from botocore.config import Config
+from botocore.exceptions import ParamValidationError
 from datetime import datetime
 from typing import Dict, List, Tuple
 
-# Fix Windows console encoding for emoji support
+try:
+    import ahocorasick  # pyahocorasick - optional, see _keyword_matcher
+except ImportError:
+    ahocorasick = None
+
+# Fix Windows console encoding for emoji support - reconfigure in place
+# instead of stacking another TextIOWrapper on the print path
 if sys.platform == 'win32':
-    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
-    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+    sys.stdout.reconfigure(encoding='utf-8')
+    sys.stderr.reconfigure(encoding='utf-8')
 
 # Configuration
 AGENT_ARN = "arn:aws:bedrock-agentcore:eu-west-1:732231126129:runtime/coach_companion-0ZUOP04U5z"
+AGENT_ID = AGENT_ARN.rsplit('/', 1)[-1]
+# AgentCore logs use a different path format
+LOG_GROUP_NAME = f"/aws/bedrock-agentcore/runtimes/{AGENT_ID}-DEFAULT"
 REGION = "eu-west-1"
 
-# Test user IDs (must be at least 33 characters - use UUIDs)
-TEST_USER_1 = str(uuid.uuid4())  # For onboarding tests
-TEST_USER_2 = str(uuid.uuid4())  # For goal setting tests
-TEST_USER_3 = str(uuid.uuid4())  # For progress tracking tests
+# Test user IDs (must be at least 33 characters - use UUIDs). Suites that
+# dispatch cases in parallel mint a fresh UUID per case instead: AgentCore
+# processes one invocation per session at a time and rejects concurrent
+# invokes that share a runtimeSessionId.
+TEST_USER_1 = str(uuid.uuid4())  # For the basic invocation test
+SESSION_RESPONSE_TIMES = str(uuid.uuid4())  # For sequential response time tests
+
+# Initialize AgentCore client (not bedrock-agent-runtime) with a tuned,
+# keep-alive connection pool; the single client is thread-safe and shared
+_cfg = Config(
+    region_name=REGION,
+    max_pool_connections=50,
+    tcp_keepalive=True,
+    retries={'mode': 'adaptive', 'max_attempts': 5},
+)
+client = boto3.client('bedrock-agentcore', config=_cfg)
 
-# Initialize AgentCore client (not bedrock-agent-runtime)
-client = boto3.client('bedrock-agentcore', region_name=REGION)
+# Request Bedrock's latency-optimized inference tier. Default off here so
+# integration runs measure the tier production uses; COACH_LATENCY_OPTIMIZED=1
+# opts in. Falls back if the botocore version doesn't accept the parameter.
+_latency_optimized = os.environ.get('COACH_LATENCY_OPTIMIZED') == '1'
 
 class TestResults:
     """Track test results."""
@@ -43,18 +72,20 @@ class TestResults:
         self.passed = 0
         self.failed = 0
         self.tests = []
-    
+        self._lock = threading.Lock()  # cases report from worker threads
+
     def add_result(self, test_name: str, passed: bool, message: str = "", duration_ms: float = 0):
-        self.tests.append({
-            "name": test_name,
-            "passed": passed,
-            "message": message,
-            "duration_ms": duration_ms
-        })
-        if passed:
-            self.passed += 1
-        else:
-            self.failed += 1
+        with self._lock:
+            self.tests.append({
+                "name": test_name,
+                "passed": passed,
+                "message": message,
+                "duration_ms": duration_ms
+            })
+            if passed:
+                self.passed += 1
+            else:
+                self.failed += 1
     
     def print_summary(self):
         print("\n" + "="*70)
@@ -80,57 +111,161 @@ class TestResults:
 
 results = TestResults()
 
-def invoke_agent(prompt: str, session_id: str) -> Tuple[str, float]:
+class TokenBucket:
+    """Thread-safe token bucket limiting the aggregate request rate.
+
+    Workers block in acquire() only when the bucket is empty, so bursts up
+    to `capacity` go straight through - unlike the fixed sleeps this
+    replaces, which throttled even when the agent had headroom.
+    """
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._last_refill = time.monotonic()
+        self._cond = threading.Condition()
+
+    def acquire(self):
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity,
+                    self._tokens + (now - self._last_refill) * self.rate
+                )
+                self._last_refill = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                self._cond.wait((1 - self._tokens) / self.rate)
+
+# Shared across every suite's worker threads: 5 requests/second sustained,
+# bursts of 10
+RATE_LIMITER = TokenBucket(rate=5, capacity=10)
+
+# Opt-in response cache for iterating on validators without re-invoking the
+# agent for prompts that haven't changed. Keyed on the exact prompt string
+# and persisted across runs; enable with COACH_TEST_CACHE=1. Leave it off
+# when actually exercising the agent - cached turns skip the runtime.
+_CACHE_ENABLED = os.environ.get('COACH_TEST_CACHE') == '1'
+_CACHE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.prompt_cache.json')
+_cache_lock = threading.Lock()
+_response_cache: Dict[str, str] = {}
+
+if _CACHE_ENABLED and os.path.exists(_CACHE_FILE):
+    try:
+        with open(_CACHE_FILE, 'r', encoding='utf-8') as f:
+            _response_cache = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        _response_cache = {}
+
+def _cache_store(prompt: str, response: str) -> None:
+    """Record a response and persist the cache to disk."""
+    with _cache_lock:
+        _response_cache[prompt] = response
+        try:
+            with open(_CACHE_FILE, 'w', encoding='utf-8') as f:
+                json.dump(_response_cache, f)
+        except OSError:
+            pass  # cache is best-effort
+
+def invoke_agent(prompt: str, session_id: str) -> Tuple[str, float, float]:
     """
     Invoke the AgentCore agent and return response with timing.
-    
+
     Uses the bedrock-agentcore client with invoke_agent_runtime method.
-    
+
     Returns:
-        Tuple of (response_text, duration_ms)
+        Tuple of (response_text, duration_ms, ttft_ms)
     """
-    start_time = time.time()
-    
+    if _CACHE_ENABLED:
+        with _cache_lock:
+            cached = _response_cache.get(prompt)
+        if cached is not None:
+            return cached, 0.0, 0.0
+
+    # Wait outside the timed section so throttling never inflates durations
+    RATE_LIMITER.acquire()
+
+    global _latency_optimized
+    # Monotonic nanosecond clock: immune to NTP adjustments and with enough
+    # resolution for sub-millisecond TTFT deltas
+    start_ns = time.perf_counter_ns()
+    ttft_ms = 0.0
+
     try:
         # Prepare payload as binary JSON
         payload = json.dumps({"prompt": prompt}).encode('utf-8')
-        
+
+        invoke_kwargs = {
+            "agentRuntimeArn": AGENT_ARN,
+            "runtimeSessionId": session_id,
+            "payload": payload,
+        }
+        if _latency_optimized:
+            invoke_kwargs["performanceConfig"] = {"latency": "optimized"}
+
         # Invoke AgentCore Runtime agent
-        response = client.invoke_agent_runtime(
-            agentRuntimeArn=AGENT_ARN,
-            runtimeSessionId=session_id,
-            payload=payload
-        )
-        
-        # Read the streaming body
-        response_body = response['response'].read()
-        response_data = json.loads(response_body.decode('utf-8'))
+        try:
+            response = client.invoke_agent_runtime(**invoke_kwargs)
+        except ParamValidationError:
+            # Client version doesn't know performanceConfig yet
+            _latency_optimized = False
+            invoke_kwargs.pop("performanceConfig", None)
+            response = client.invoke_agent_runtime(**invoke_kwargs)
+
+        # Consume the streaming body incrementally so first-byte latency
+        # is measurable instead of hidden inside one blocking read()
+        buffer = bytearray()
+        for chunk in response['response'].iter_chunks():
+            if not buffer:
+                ttft_ms = (time.perf_counter_ns() - start_ns) / 1_000_000
+            buffer += chunk
+        response_data = json.loads(bytes(buffer).decode('utf-8'))
         
-        # Extract text from the response structure
+        # Extract text from the response structure - single join instead of
+        # quadratic string concatenation
         # Format: {"response": {"role": "assistant", "content": [{"text": "..."}]}}
-        full_response = ""
         if 'response' in response_data:
             content = response_data['response'].get('content', [])
-            for item in content:
-                if 'text' in item:
-                    full_response += item['text']
+            full_response = ''.join(item['text'] for item in content if 'text' in item)
         else:
             # Fallback: try to get response directly
             full_response = str(response_data)
         
-        duration_ms = (time.time() - start_time) * 1000
-        return full_response, duration_ms
-    
+        duration_ms = (time.perf_counter_ns() - start_ns) / 1_000_000
+        if _CACHE_ENABLED and full_response:
+            _cache_store(prompt, full_response)
+        return full_response, duration_ms, ttft_ms
+
     except Exception as e:
-        duration_ms = (time.time() - start_time) * 1000
+        duration_ms = (time.perf_counter_ns() - start_ns) / 1_000_000
         raise Exception(f"Agent invocation failed: {str(e)}")
 
+def _failure_snapshot() -> int:
+    """Number of failures recorded so far (for per-suite assertions)."""
+    with results._lock:
+        return results.failed
+
+def _assert_no_new_failures(failed_before: int) -> None:
+    """Under pytest, fail the test if its suite recorded new case failures.
+
+    Standalone runs skip the assert so main() can run every suite and
+    report through the summary and results file as before.
+    """
+    if "PYTEST_CURRENT_TEST" not in os.environ:
+        return
+    with results._lock:
+        failures = [t for t in results.tests if not t["passed"]][failed_before:]
+    assert not failures, "; ".join(f"{t['name']}: {t['message']}" for t in failures)
+
 def test_basic_invocation():
     """Test 15.1.1: Basic agent invocation works."""
     print("\n--- Test: Basic Invocation ---")
-    
+
+    failed_before = _failure_snapshot()
     try:
-        response, duration = invoke_agent("Hello", TEST_USER_1)
+        response, duration, ttft = invoke_agent("Hello", TEST_USER_1)
         
         if response and len(response) > 0:
             print(f"✅ Agent responded: {response[:100]}...")
@@ -141,165 +276,193 @@ def test_basic_invocation():
     except Exception as e:
         print(f"❌ Error: {e}")
         results.add_result("Basic Invocation", False, str(e))
+    _assert_no_new_failures(failed_before)
+
+# Worker pool size for dispatching a suite's independent cases in parallel
+_MAX_WORKERS = max((os.cpu_count() or 4) - 2, 2)
+
+def _run_case(suite: str, test_name: str, prompt: str, validate) -> None:
+    """Run one test case and record the result.
+
+    validate(response) returns (passed, failure_message); cases within a
+    suite are independent, so the suites dispatch them through a thread
+    pool instead of a serial loop with sleeps. Each case gets its own
+    session ID - concurrent invocations sharing one session are rejected.
+    """
+    try:
+        print(f"\nTesting: {test_name}")
+        print(f"Prompt: {prompt}")
+
+        response, duration, ttft = invoke_agent(prompt, str(uuid.uuid4()))
+
+        passed, failure_message = validate(response)
+        if passed:
+            print(f"✅ Response ({duration:.0f}ms): {response[:150]}...")
+            results.add_result(f"{suite} - {test_name}", True, duration_ms=duration)
+        else:
+            print(f"❌ {failure_message}")
+            results.add_result(f"{suite} - {test_name}", False, failure_message)
+
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        results.add_result(f"{suite} - {test_name}", False, str(e))
+
+def _run_suite(suite: str, test_cases, validate) -> None:
+    """Dispatch a suite's cases across the worker pool."""
+    with concurrent.futures.ThreadPoolExecutor(max_workers=_MAX_WORKERS) as executor:
+        futures = [
+            executor.submit(_run_case, suite, test_name, prompt, validate)
+            for prompt, test_name in test_cases
+        ]
+        concurrent.futures.wait(futures)
+
+def _validate_not_short(response: str):
+    """Check response is not empty and seems relevant."""
+    if response and len(response) > 20:
+        return True, ""
+    return False, "Response too short"
+
+# Keyword scanning: both paths do a single O(n) pass over the response
+# instead of one substring scan (and one .lower() copy) per keyword. With
+# pyahocorasick installed the pass runs through a precompiled automaton in
+# C and stays O(n) however large the keyword set grows; otherwise a
+# compiled alternation regex covers the current small sets just as well.
+_GOAL_KEYWORDS = ("goal", "plan", "achieve", "realistic", "step")
+_COACH_KEYWORDS = ("progress", "great", "keep", "continue", "proud", "understand")
+
+def _keyword_matcher(keywords):
+    """Build a predicate testing whether any keyword occurs in the text."""
+    if ahocorasick is not None:
+        automaton = ahocorasick.Automaton()
+        for keyword in keywords:
+            automaton.add_word(keyword, keyword)
+        automaton.make_automaton()
+        return lambda text: next(automaton.iter(text.lower()), None) is not None
+    pattern = re.compile('|'.join(keywords), re.IGNORECASE)
+    return lambda text: pattern.search(text) is not None
+
+_has_goal_content = _keyword_matcher(_GOAL_KEYWORDS)
+_has_coaching_tone = _keyword_matcher(_COACH_KEYWORDS)
+
+def _validate_goal_content(response: str):
+    """Check for goal-related keywords in response."""
+    if response and _has_goal_content(response):
+        return True, ""
+    return False, "Missing goal content"
+
+def _validate_coaching_tone(response: str):
+    """Check for supportive/coaching keywords."""
+    if response and _has_coaching_tone(response):
+        return True, ""
+    return False, "Missing coaching tone"
 
 def test_onboarding_flow():
     """Test 15.1: User onboarding flow."""
     print("\n--- Test: User Onboarding Flow ---")
-    
+
     test_cases = [
         ("I'm new here and want to start my weight loss journey", "introduction"),
         ("I want to lose weight", "goal_statement"),
         ("I'm on Ozempic", "medication_disclosure"),
         ("I prefer gentle coaching", "coaching_style"),
     ]
-    
-    for prompt, test_name in test_cases:
-        try:
-            print(f"\nTesting: {test_name}")
-            print(f"Prompt: {prompt}")
-            
-            response, duration = invoke_agent(prompt, TEST_USER_1)
-            
-            # Check response is not empty and seems relevant
-            if response and len(response) > 20:
-                print(f"✅ Response ({duration:.0f}ms): {response[:150]}...")
-                results.add_result(f"Onboarding - {test_name}", True, duration_ms=duration)
-            else:
-                print(f"❌ Response too short or empty")
-                results.add_result(f"Onboarding - {test_name}", False, "Response too short")
-        
-        except Exception as e:
-            print(f"❌ Error: {e}")
-            results.add_result(f"Onboarding - {test_name}", False, str(e))
-        
-        time.sleep(1)  # Rate limiting
+
+    failed_before = _failure_snapshot()
+    _run_suite("Onboarding", test_cases, _validate_not_short)
+    _assert_no_new_failures(failed_before)
 
 def test_goal_setting():
     """Test 15.2: Goal setting scenarios."""
     print("\n--- Test: Goal Setting ---")
-    
+
     test_cases = [
         ("I want to lose 10 pounds in 3 months", "realistic_goal"),
         ("My goal is to maintain my current weight", "maintenance_goal"),
         ("I want to transition off my medication", "transition_goal"),
         ("I want to lose 50 pounds in 1 month", "unrealistic_goal"),
     ]
-    
-    for prompt, test_name in test_cases:
-        try:
-            print(f"\nTesting: {test_name}")
-            print(f"Prompt: {prompt}")
-            
-            response, duration = invoke_agent(prompt, TEST_USER_2)
-            
-            # Check for goal-related keywords in response
-            goal_keywords = ["goal", "plan", "achieve", "realistic", "step"]
-            has_goal_content = any(keyword in response.lower() for keyword in goal_keywords)
-            
-            if response and has_goal_content:
-                print(f"✅ Response ({duration:.0f}ms): {response[:150]}...")
-                results.add_result(f"Goal Setting - {test_name}", True, duration_ms=duration)
-            else:
-                print(f"❌ Response doesn't address goal setting")
-                results.add_result(f"Goal Setting - {test_name}", False, "Missing goal content")
-        
-        except Exception as e:
-            print(f"❌ Error: {e}")
-            results.add_result(f"Goal Setting - {test_name}", False, str(e))
-        
-        time.sleep(1)
+
+    failed_before = _failure_snapshot()
+    _run_suite("Goal Setting", test_cases, _validate_goal_content)
+    _assert_no_new_failures(failed_before)
 
 def test_progress_tracking():
     """Test 15.3: Progress tracking scenarios."""
     print("\n--- Test: Progress Tracking ---")
-    
+
     test_cases = [
         ("I lost 2 pounds this week!", "positive_progress"),
         ("I gained a pound this week", "setback"),
         ("My weight stayed the same", "plateau"),
         ("I'm feeling more energetic", "non_scale_victory"),
     ]
-    
-    for prompt, test_name in test_cases:
-        try:
-            print(f"\nTesting: {test_name}")
-            print(f"Prompt: {prompt}")
-            
-            response, duration = invoke_agent(prompt, TEST_USER_3)
-            
-            # Check for supportive/coaching keywords
-            coaching_keywords = ["progress", "great", "keep", "continue", "proud", "understand"]
-            has_coaching = any(keyword in response.lower() for keyword in coaching_keywords)
-            
-            if response and has_coaching:
-                print(f"✅ Response ({duration:.0f}ms): {response[:150]}...")
-                results.add_result(f"Progress - {test_name}", True, duration_ms=duration)
-            else:
-                print(f"❌ Response lacks coaching tone")
-                results.add_result(f"Progress - {test_name}", False, "Missing coaching tone")
-        
-        except Exception as e:
-            print(f"❌ Error: {e}")
-            results.add_result(f"Progress - {test_name}", False, str(e))
-        
-        time.sleep(1)
+
+    failed_before = _failure_snapshot()
+    _run_suite("Progress", test_cases, _validate_coaching_tone)
+    _assert_no_new_failures(failed_before)
+
+def _run_error_case(prompt: str, test_name: str) -> None:
+    """Run one error-scenario case; exceptions count as handled.
+
+    Cases run in parallel, so each gets its own session ID.
+    """
+    try:
+        print(f"\nTesting: {test_name}")
+
+        response, duration, ttft = invoke_agent(prompt, str(uuid.uuid4()))
+
+        # Agent should respond without crashing
+        if response:
+            print(f"✅ Agent handled gracefully ({duration:.0f}ms)")
+            results.add_result(f"Error - {test_name}", True, duration_ms=duration)
+        else:
+            print(f"❌ No response")
+            results.add_result(f"Error - {test_name}", False, "No response")
+
+    except Exception as e:
+        # Some errors are expected, but agent shouldn't crash
+        print(f"⚠️  Exception (may be expected): {e}")
+        results.add_result(f"Error - {test_name}", True, f"Exception handled: {str(e)[:50]}")
 
 def test_error_scenarios():
     """Test 15.5: Error handling scenarios."""
     print("\n--- Test: Error Scenarios ---")
-    
+
     test_cases = [
         ("", "empty_input"),
         ("a" * 10000, "very_long_input"),
         ("🎉🎊🎈", "emoji_only"),
         ("What's the weather?", "off_topic"),
     ]
-    
-    for prompt, test_name in test_cases:
-        try:
-            print(f"\nTesting: {test_name}")
-            
-            if test_name == "empty_input":
-                # Empty input should be handled gracefully
-                print("Skipping empty input test (would fail validation)")
-                results.add_result(f"Error - {test_name}", True, "Skipped - validation expected")
-                continue
-            
-            # Use UUID for session ID (must be at least 33 characters)
-            session_id = str(uuid.uuid4())
-            response, duration = invoke_agent(prompt, session_id)
-            
-            # Agent should respond without crashing
-            if response:
-                print(f"✅ Agent handled gracefully ({duration:.0f}ms)")
-                results.add_result(f"Error - {test_name}", True, duration_ms=duration)
-            else:
-                print(f"❌ No response")
-                results.add_result(f"Error - {test_name}", False, "No response")
-        
-        except Exception as e:
-            # Some errors are expected, but agent shouldn't crash
-            print(f"⚠️  Exception (may be expected): {e}")
-            results.add_result(f"Error - {test_name}", True, f"Exception handled: {str(e)[:50]}")
-        
-        time.sleep(1)
+
+    # Empty input should be handled gracefully
+    print("Skipping empty input test (would fail validation)")
+    results.add_result("Error - empty_input", True, "Skipped - validation expected")
+
+    failed_before = _failure_snapshot()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=_MAX_WORKERS) as executor:
+        futures = [
+            executor.submit(_run_error_case, prompt, test_name)
+            for prompt, test_name in test_cases
+            if test_name != "empty_input"
+        ]
+        concurrent.futures.wait(futures)
+    _assert_no_new_failures(failed_before)
 
 def test_response_times():
     """Test 15.7: Measure response times."""
     print("\n--- Test: Response Times ---")
-    
+
+    failed_before = _failure_snapshot()
     durations = []
     num_tests = 5
     
     for i in range(num_tests):
         try:
             prompt = f"Give me a quick tip for staying motivated (test {i+1})"
-            # Use UUID for session ID
-            session_id = str(uuid.uuid4())
-            response, duration = invoke_agent(prompt, session_id)
+            response, duration, ttft = invoke_agent(prompt, SESSION_RESPONSE_TIMES)
             durations.append(duration)
             print(f"  Test {i+1}: {duration:.0f}ms")
-            time.sleep(0.5)
         except Exception as e:
             print(f"  Test {i+1}: Failed - {e}")
     
@@ -330,76 +493,85 @@ def test_response_times():
             results.add_result("Response Time - Max", False, f"{max_duration:.0f}ms > 10000ms")
     else:
         results.add_result("Response Time", False, "No successful tests")
+    _assert_no_new_failures(failed_before)
 
 def test_cloudwatch_logs():
     """Test 15.8: Verify CloudWatch logs are being written."""
     print("\n--- Test: CloudWatch Logs ---")
-    
-    # AgentCore logs use a different path format
-    log_group = f"/aws/bedrock-agentcore/runtimes/{AGENT_ARN.split('/')[-1]}-DEFAULT"
+
+    failed_before = _failure_snapshot()
     logs_client = boto3.client('logs', region_name=REGION)
     
     try:
-        # Check if log group exists
+        # Ask for our agent's group directly - prefixing with the full group
+        # name means one result instead of paging every runtime's groups
+        # through a client-side filter
         response = logs_client.describe_log_groups(
-            logGroupNamePrefix="/aws/bedrock-agentcore/runtimes/",
-            limit=10
+            logGroupNamePrefix=LOG_GROUP_NAME,
+            limit=1
         )
-        
+
         if response['logGroups']:
-            print(f"✅ Found {len(response['logGroups'])} AgentCore log group(s)")
-            
-            # Try to find our specific agent's logs
-            agent_id = AGENT_ARN.split('/')[-1]
-            matching_groups = [lg for lg in response['logGroups'] if agent_id in lg['logGroupName']]
-            
-            if matching_groups:
-                log_group_name = matching_groups[0]['logGroupName']
-                print(f"  Log group: {log_group_name}")
-                
-                # Check for recent log streams
-                streams = logs_client.describe_log_streams(
-                    logGroupName=log_group_name,
-                    orderBy='LastEventTime',
-                    descending=True,
-                    limit=5
-                )
-                
-                if streams['logStreams']:
-                    latest_stream = streams['logStreams'][0]
-                    last_event_time = latest_stream.get('lastEventTime', 0)
-                    
-                    # Check if logs are recent (within last hour)
-                    current_time = int(time.time() * 1000)
-                    age_minutes = (current_time - last_event_time) / 1000 / 60
-                    
-                    print(f"  Latest log stream: {latest_stream['logStreamName']}")
-                    print(f"  Last event: {age_minutes:.1f} minutes ago")
-                    
-                    if age_minutes < 60:
-                        print(f"✅ Recent logs found")
-                        results.add_result("CloudWatch Logs - Recent", True)
-                    else:
-                        print(f"⚠️  No recent logs (last event {age_minutes:.0f} min ago)")
-                        results.add_result("CloudWatch Logs - Recent", False, f"Last event {age_minutes:.0f} min ago")
+            log_group_name = response['logGroups'][0]['logGroupName']
+            print(f"  Log group: {log_group_name}")
+
+            # Only the most recent stream matters for the freshness check
+            streams = logs_client.describe_log_streams(
+                logGroupName=log_group_name,
+                orderBy='LastEventTime',
+                descending=True,
+                limit=1
+            )
+
+            if streams['logStreams']:
+                latest_stream = streams['logStreams'][0]
+                last_event_time = latest_stream.get('lastEventTime', 0)
+
+                # Check if logs are recent (within last hour)
+                current_time = int(time.time() * 1000)
+                age_minutes = (current_time - last_event_time) / 1000 / 60
+
+                print(f"  Latest log stream: {latest_stream['logStreamName']}")
+                print(f"  Last event: {age_minutes:.1f} minutes ago")
+
+                if age_minutes < 60:
+                    print(f"✅ Recent logs found")
+                    results.add_result("CloudWatch Logs - Recent", True)
                 else:
-                    print(f"⚠️  No log streams found")
-                    results.add_result("CloudWatch Logs - Streams", False, "No streams")
-                
-                results.add_result("CloudWatch Logs - Exists", True)
+                    print(f"⚠️  No recent logs (last event {age_minutes:.0f} min ago)")
+                    results.add_result("CloudWatch Logs - Recent", False, f"Last event {age_minutes:.0f} min ago")
             else:
-                print(f"⚠️  No log group found for agent {agent_id}")
-                results.add_result("CloudWatch Logs - Exists", False, f"No logs for {agent_id}")
+                print(f"⚠️  No log streams found")
+                results.add_result("CloudWatch Logs - Streams", False, "No streams")
+
+            results.add_result("CloudWatch Logs - Exists", True)
         else:
-            print(f"❌ No AgentCore log groups found")
-            results.add_result("CloudWatch Logs - Exists", False, "No log groups")
+            print(f"⚠️  No log group found at {LOG_GROUP_NAME}")
+            results.add_result("CloudWatch Logs - Exists", False, f"No log group {LOG_GROUP_NAME}")
     
     except Exception as e:
         print(f"❌ Error checking logs: {e}")
         results.add_result("CloudWatch Logs", False, str(e))
+    _assert_no_new_failures(failed_before)
 
 def main():
-    """Run all integration tests."""
+    """Run the suites sharded across cores when pytest-xdist is available.
+
+    Each top-level test function is an independent suite, so xdist can
+    distribute them over worker processes. Without pytest/pytest-xdist
+    installed, fall back to the sequential run with its summary report.
+    """
+    try:
+        import pytest
+        import xdist  # noqa: F401 - only checking pytest -n will work
+    except ImportError:
+        _run_sequential()
+        return
+    workers = max((os.cpu_count() or 4) - 2, 2)
+    exit(pytest.main(['-n', str(workers), '-q', os.path.abspath(__file__)]))
+
+def _run_sequential():
+    """Run all integration tests in-process."""
     print("="*70)
     print("COACH COMPANION INTEGRATION TESTS")
     print("="*70)
@@ -424,8 +596,8 @@ def main():
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
     results_file = f"tests/integration-results-{timestamp}.json"
     
-    with open(results_file, 'w') as f:
-        json.dump({
+    with open(results_file, 'wb') as f:
+        f.write(orjson.dumps({
             "timestamp": datetime.now().isoformat(),
             "agent_arn": AGENT_ARN,
             "region": REGION,
@@ -436,7 +608,7 @@ def main():
                 "success_rate": results.passed / (results.passed + results.failed) * 100
             },
             "tests": results.tests
-        }, f, indent=2)
+        }, option=orjson.OPT_INDENT_2))
     
     print(f"\nResults saved to: {results_file}")
     